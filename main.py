@@ -8,25 +8,45 @@ Schema: Simple flat structure with BFFO_Address elements
 Fields: BfpoNum, Loc, PstCd, Ctry, CtryCd, Type
 
 Dependencies:
-    pip install requests beautifulsoup4 lxml pandas odfpy pycountry --break-system-packages
+    pip install requests lxml pandas odfpy pycountry --break-system-packages
 
 Usage:
     python bfpo_scraper_simple.py
 """
+import operator
 import os
+import re
+import shutil
 import sys
 import traceback
 import tempfile
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from typing import Iterator, Optional
+from lxml import etree
+from lxml import html as lhtml
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pycountry
 
 
+@dataclass(slots=True)
+class BFPOAddress:
+    """A single BFPO address record (field names match the XML schema)."""
+    BfpoNum: str
+    Loc: str
+    Type: str
+    BoxNum: Optional[str] = None
+    PstCd: Optional[str] = None
+    Ctry: Optional[str] = None
+    CtryCd: Optional[str] = None
+    sort_key: int = 999  # numeric part of BfpoNum, for output ordering
+
+
 class CountryCodeResolver:
     """Resolve country names to ISO 3166-1 alpha-2 codes using pycountry."""
 
@@ -41,6 +61,29 @@ class CountryCodeResolver:
         'Africa': 'AF',  # Generic Africa (for operations without specific country)
     }
 
+    # All ISO 3166-1 alpha-2 codes plus the user-assigned specials above,
+    # materialised once so validation is a plain set membership test
+    _VALID_ALPHA2 = (frozenset(c.alpha_2 for c in pycountry.countries)
+                     | frozenset(SPECIAL_CASES.values()))
+
+    # Casefolded name -> alpha-2 map built once, covering ISO, common and
+    # official names plus the special cases, so case handling is a property
+    # of the lookup rather than of the query string
+    _BY_CASEFOLD_NAME = {
+        name.casefold(): country.alpha_2
+        for country in pycountry.countries
+        for name in (country.name,
+                     getattr(country, 'common_name', None),
+                     getattr(country, 'official_name', None))
+        if name
+    }
+    _BY_CASEFOLD_NAME.update(
+        {name.casefold(): code for name, code in SPECIAL_CASES.items()})
+
+    # Names that failed every lookup, collected here and reported once at
+    # the end of the run instead of printing from the hot path
+    unmapped_names: set[str] = set()
+
     @staticmethod
     def get_country_code(country_name: str) -> Optional[str]:
         """
@@ -55,19 +98,30 @@ class CountryCodeResolver:
         if not country_name:
             return None
 
-        # Check special cases first
-        if country_name in CountryCodeResolver.SPECIAL_CASES:
-            return CountryCodeResolver.SPECIAL_CASES[country_name]
+        return CountryCodeResolver._resolve_country_code(country_name)
 
-        # Try exact match by name
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _resolve_country_code(country_name: str) -> Optional[str]:
+        """
+        Resolve a country name to its alpha-2 code (memoized).
+
+        The FCDO sheet repeats a small set of country names thousands of
+        times, so each unique name only pays the pycountry lookup cost once.
+        """
+        # Direct casefolded lookup - special cases and ISO, common and
+        # official names in any casing, one dict hit
+        code = CountryCodeResolver._BY_CASEFOLD_NAME.get(country_name.casefold())
+        if code:
+            return code
+
+        # Try indexed lookup - also matches alpha-2/alpha-3 codes
         try:
-            country = pycountry.countries.get(name=country_name)
-            if country:
-                return country.alpha_2
-        except (KeyError, AttributeError):
+            return pycountry.countries.lookup(country_name).alpha_2
+        except LookupError:
             pass
 
-        # Try fuzzy search (case-insensitive)
+        # Fall back to fuzzy search (Levenshtein-based, expensive)
         try:
             countries = pycountry.countries.search_fuzzy(country_name)
             if countries:
@@ -75,23 +129,8 @@ class CountryCodeResolver:
         except LookupError:
             pass
 
-        # Try common name variations
-        name_variations = [
-            country_name.upper(),
-            country_name.lower(),
-            country_name.title(),
-        ]
-
-        for variation in name_variations:
-            try:
-                country = pycountry.countries.get(common_name=variation)
-                if country:
-                    return country.alpha_2
-            except (KeyError, AttributeError):
-                pass
-
-        # Log warning for unmapped countries
-        print(f"  Warning: Could not map country '{country_name}' to ISO code")
+        # Record for the end-of-run warning summary
+        CountryCodeResolver.unmapped_names.add(country_name)
         return None
 
     @staticmethod
@@ -108,15 +147,7 @@ class CountryCodeResolver:
         if not code or len(code) != 2:
             return False
 
-        # Check special cases
-        if code in CountryCodeResolver.SPECIAL_CASES.values():
-            return True
-
-        try:
-            pycountry.countries.get(alpha_2=code.upper())
-            return True
-        except (KeyError, AttributeError):
-            return False
+        return code.upper() in CountryCodeResolver._VALID_ALPHA2
 
 
 class BFPOScraperSimple:
@@ -125,32 +156,149 @@ class BFPOScraperSimple:
     GOV_UK_BFPO_URL = "https://www.gov.uk/bfpo/find-a-bfpo-number"
     FCDO_ODS_URL = "https://assets.publishing.service.gov.uk/media/5f3f87ae8fa8f5371bb55f64/20200820-Foreign__Commonwealth_and_Development_Office_BFPO_Indicator_List_v2.ods"
 
+    # Common patterns for inferring country from city/location
+    _CITY_TO_COUNTRY = {
+        # Europe
+        'ankara': 'Turkey',
+        'paris': 'France',
+        'berlin': 'Germany',
+        'madrid': 'Spain',
+        'rome': 'Italy',
+        'athens': 'Greece',
+        'vienna': 'Austria',
+        'brussels': 'Belgium',
+        'amsterdam': 'Netherlands',
+        'dublin': 'Ireland',
+        'lisbon': 'Portugal',
+        'copenhagen': 'Denmark',
+        'stockholm': 'Sweden',
+        'oslo': 'Norway',
+        'helsinki': 'Finland',
+        'warsaw': 'Poland',
+        'prague': 'Czech Republic',
+        'budapest': 'Hungary',
+        'bucharest': 'Romania',
+        'sofia': 'Bulgaria',
+        'moscow': 'Russia',
+
+        # Americas
+        'ottawa': 'Canada',
+        'washington': 'USA',
+        'new york': 'USA',
+        'los angeles': 'USA',
+        'san francisco': 'USA',
+        'chicago': 'USA',
+        'boston': 'USA',
+        'atlanta': 'USA',
+        'mexico city': 'Mexico',
+        'brasilia': 'Brazil',
+        'buenos aires': 'Argentina',
+        'santiago': 'Chile',
+        'lima': 'Peru',
+        'bogota': 'Colombia',
+
+        # Asia
+        'tokyo': 'Japan',
+        'beijing': 'China',
+        'shanghai': 'China',
+        'seoul': 'South Korea',
+        'delhi': 'India',
+        'mumbai': 'India',
+        'bangkok': 'Thailand',
+        'singapore': 'Singapore',
+        'jakarta': 'Indonesia',
+        'manila': 'Philippines',
+        'kuala lumpur': 'Malaysia',
+        'hanoi': 'Vietnam',
+        'islamabad': 'Pakistan',
+        'kabul': 'Afghanistan',
+        'tehran': 'Iran',
+        'riyadh': 'Saudi Arabia',
+        'dubai': 'United Arab Emirates',
+        'abu dhabi': 'United Arab Emirates',
+
+        # Oceania
+        'canberra': 'Australia',
+        'sydney': 'Australia',
+        'melbourne': 'Australia',
+        'wellington': 'New Zealand',
+        'auckland': 'New Zealand',
+
+        # Africa
+        'cairo': 'Egypt',
+        'nairobi': 'Kenya',
+        'johannesburg': 'South Africa',
+        'pretoria': 'South Africa',
+        'lagos': 'Nigeria',
+        'abuja': 'Nigeria',
+        'addis ababa': 'Ethiopia',
+        'accra': 'Ghana',
+        'dar es salaam': 'Tanzania',
+        'kampala': 'Uganda',
+    }
+
+    # Compiled once for the class: one alternation so each location is
+    # scanned in a single C-level pass. Longest patterns first so e.g.
+    # 'abu dhabi' wins over any shorter overlap
+    _CITY_PATTERN = re.compile('|'.join(
+        re.escape(city) for city in
+        sorted(_CITY_TO_COUNTRY, key=len, reverse=True)
+    ))
+
     def __init__(self, output_file: str = "bfpo_config.xml", fcdo_ods_file: Optional[str] = None):
         self.output_file = output_file
         self.fcdo_ods_file = fcdo_ods_file  # Optional pre-downloaded ODS file
-        self.addresses = []  # List of BFPO addresses
+        self.addresses: list[BFPOAddress] = []
         self.country_resolver = CountryCodeResolver()
 
-    def scrape_gov_uk_bfpo(self) -> None:
-        """Scrape BFPO locations from GOV.UK HTML page and FCO"""
-        print("\nScraping GOV.UK BFPO locations...")
+        # Shared HTTP session: reuses adapter connection pools and retries
+        # transient gateway errors instead of failing the whole run
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=[502, 503, 504]))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _fetch_gov_uk_html(self) -> bytes:
+        """Download the GOV.UK BFPO page and return the raw HTML bytes."""
+        print("\nDownloading GOV.UK BFPO page...")
 
         try:
-            response = requests.get(self.GOV_UK_BFPO_URL, timeout=30)
+            response = self.session.get(self.GOV_UK_BFPO_URL, timeout=30)
             response.raise_for_status()
+            return response.content
+
+        except Exception as e:
+            print(f"✗ Error downloading GOV.UK page: {e}")
+            raise
+
+    def parse_gov_uk_html(self, html: bytes) -> None:
+        """Parse BFPO locations from GOV.UK HTML page and FCO"""
+        print("\nScraping GOV.UK BFPO locations...")
+
+        try:
+            tree = lhtml.fromstring(html)
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Map each id'd heading to the table that follows it in one
+            # document pass, instead of a root-to-leaf find() per section
+            sections = {
+                heading.get('id'): next(iter(
+                    heading.xpath('following::table[1]')), None)
+                for heading in tree.xpath('//h2[@id] | //h3[@id]')
+            }
 
             # Parse each section
-            self._parse_germany_locations(soup)
-            self._parse_uk_locations(soup)
-            self._parse_europe_locations(soup)
-            self._parse_world_locations(soup)
-            self._parse_ships(soup)
-            self._parse_naval_parties(soup)
-            self._parse_operations(soup)
-            self._parse_exercises(soup)
-            self._parse_isolated_detachments(soup)
+            self._parse_germany_locations(sections)
+            self._parse_uk_locations(sections)
+            self._parse_europe_locations(sections)
+            self._parse_world_locations(sections)
+            self._parse_ships(sections)
+            self._parse_naval_parties(sections)
+            self._parse_operations(sections)
+            self._parse_exercises(sections)
+            self._parse_isolated_detachments(sections)
 
             print(f"✓ Scraped {len(self.addresses)} BFPO addresses from GOV.UK")
 
@@ -158,14 +306,19 @@ class BFPOScraperSimple:
             print(f"✗ Error scraping GOV.UK: {e}")
             raise
 
-    def _parse_table_rows(self, table) -> list[list[str]]:
-        """Extract rows from HTML table."""
-        rows = []
-        for tr in table.find_all('tr')[1:]:  # Skip header
-            cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
+    # Compiled once: row/cell extraction runs entirely inside libxml2
+    _ALL_TR = etree.XPath('.//tr')
+    _CELLS_XPATH = etree.XPath('./td|./th')
+
+    def _parse_table_rows(self, table) -> Iterator[list[str]]:
+        """Yield cell-text rows from an HTML table, skipping the header."""
+        # Skip exactly one header row in document order - a position()
+        # predicate would restart per parent and also drop the first
+        # tbody row on GOV.UK's thead/tbody tables
+        for tr in self._ALL_TR(table)[1:]:
+            cells = [td.text_content().strip() for td in self._CELLS_XPATH(tr)]
             if cells:
-                rows.append(cells)
-        return rows
+                yield cells
 
     def _add_address(self, bfpo_num: str, location: str, postcode: Optional[str] = None,
                      country: Optional[str] = None, bfpo_type: str = 'static',
@@ -176,138 +329,83 @@ class BFPOScraperSimple:
         if not bfpo_num.upper().startswith('BFPO'):
             bfpo_num = f'BFPO {bfpo_num}'
 
-        address = {
-            'BfpoNum': bfpo_num,
-            'Loc': location,
-            'Type': bfpo_type
-        }
-
-        if box_num:
-            address['BoxNum'] = box_num
+        # Parse the numeric part once here rather than on every sort
+        num_part = bfpo_num.replace('BFPO ', '').strip()
 
-        if postcode:
-            address['PstCd'] = postcode
+        address = BFPOAddress(BfpoNum=bfpo_num, Loc=location, Type=bfpo_type,
+                              BoxNum=box_num, PstCd=postcode,
+                              sort_key=int(num_part) if num_part.isdigit() else 999)
 
         if overwrite_country:
-            address['CtryCd'] = 'GB'
+            address.CtryCd = 'GB'
         elif country:
-            address['Ctry'] = country
-            country_code = self.country_resolver.get_country_code(country)
-            if country_code:
-                address['CtryCd'] = country_code
+            address.Ctry = country
+            address.CtryCd = self.country_resolver.get_country_code(country)
 
         self.addresses.append(address)
 
-    def _parse_germany_locations(self, soup) -> None:
+    def _parse_germany_locations(self, sections) -> None:
         """Parse Germany BFPO locations."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='germany-bfpo-locations')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Germany' in s and 'BFPO' in s)
-        if not heading:
+        table = sections.get('germany-bfpo-locations')
+        if table is None:
             print("  Warning: Could not find Germany BFPO locations section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 self._add_address(row[1], row[0], row[2], 'Germany', 'static')
 
-    def _parse_uk_locations(self, soup) -> None:
+    def _parse_uk_locations(self, sections) -> None:
         """Parse UK BFPO locations."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='uk-bfpo-locations')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'UK' in s and 'BFPO' in s)
-        if not heading:
+        table = sections.get('uk-bfpo-locations')
+        if table is None:
             print("  Warning: Could not find UK BFPO locations section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 self._add_address(row[1], row[0], row[2], 'United Kingdom', 'static')
 
-    def _parse_europe_locations(self, soup) -> None:
+    def _parse_europe_locations(self, sections) -> None:
         """Parse Europe BFPO locations."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='rest-of-europe-bfpo-locations')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Rest of Europe' in s)
-        if not heading:
+        table = sections.get('rest-of-europe-bfpo-locations')
+        if table is None:
             print("  Warning: Could not find Europe BFPO locations section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 4:
                 self._add_address(row[1], row[0], row[2], row[3], 'static')
 
-    def _parse_world_locations(self, soup) -> None:
+    def _parse_world_locations(self, sections) -> None:
         """Parse rest of world BFPO locations."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='rest-of-the-world-bfpo-locations')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Rest of the world' in s)
-        if not heading:
+        table = sections.get('rest-of-the-world-bfpo-locations')
+        if table is None:
             print("  Warning: Could not find World BFPO locations section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 4:
                 self._add_address(row[1], row[0], row[2], row[3], 'static')
 
-    def _parse_ships(self, soup) -> None:
+    def _parse_ships(self, sections) -> None:
         """Parse HM Ships."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='hm-ships')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'HM Ships' in s)
-        if not heading:
+        table = sections.get('hm-ships')
+        if table is None:
             print("  Warning: Could not find HM Ships section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 self._add_address(row[1], row[0], row[2], None, 'ship')
 
-    def _parse_naval_parties(self, soup) -> None:
+    def _parse_naval_parties(self, sections) -> None:
         """Parse Naval parties."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='naval-parties')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Naval parties' in s)
-        if not heading:
+        table = sections.get('naval-parties')
+        if table is None:
             print("  Warning: Could not find Naval parties section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 # Naval parties often have location in first column
@@ -329,59 +427,35 @@ class BFPOScraperSimple:
 
                 self._add_address(row[1], location, row[2], country, 'navalparty')
 
-    def _parse_operations(self, soup) -> None:
+    def _parse_operations(self, sections) -> None:
         """Parse Operations."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='operations')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Operations' in s)
-        if not heading:
+        table = sections.get('operations')
+        if table is None:
             print("  Warning: Could not find Operations section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 self._add_address(row[1], row[0], row[2], None, 'operation')
 
-    def _parse_exercises(self, soup) -> None:
+    def _parse_exercises(self, sections) -> None:
         """Parse Exercises."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h2', id='exercises')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h2', string=lambda s: s and 'Exercises' in s)
-        if not heading:
+        table = sections.get('exercises')
+        if table is None:
             print("  Warning: Could not find Exercises section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         for row in self._parse_table_rows(table):
             if len(row) >= 3:
                 self._add_address(row[1], row[0], row[2], None, 'exercise')
 
-    def _parse_isolated_detachments(self, soup) -> None:
+    def _parse_isolated_detachments(self, sections) -> None:
         """Parse isolated detachments in Germany (BFPO 105 box numbers)."""
-        # Use id attribute which is more reliable than text matching
-        heading = soup.find('h3', id='isolated-detachments-box-numbers')
-        if not heading:
-            # Fallback to text search
-            heading = soup.find('h3', string=lambda s: s and 'Isolated detachments' in s)
-        if not heading:
+        table = sections.get('isolated-detachments-box-numbers')
+        if table is None:
             print("  Warning: Could not find Isolated detachments section")
             return
 
-        table = heading.find_next('table')
-        if not table:
-            return
-
         # Table structure: Location | Box number
         ISOLATED_DETACHMENT_POSTCODE = 'BF1 0AX'
 
@@ -401,18 +475,21 @@ class BFPOScraperSimple:
                     )
 
     def download_fcdo_ods(self) -> Optional[str]:
-        """Download FCDO ODS file to temporary location."""
+        """Stream the FCDO ODS file down to a temporary location."""
 
         print("\nDownloading FCDO ODS file...")
 
         try:
-            response = requests.get(self.FCDO_ODS_URL, timeout=30)
-            response.raise_for_status()
+            with self.session.get(self.FCDO_ODS_URL, timeout=30,
+                                  stream=True) as response:
+                response.raise_for_status()
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.ods')
-            temp_file.write(response.content)
-            temp_file.close()
+                # Copy to disk in 64KB chunks so the multi-MB file never
+                # sits fully in memory (decompressing on the fly if needed)
+                response.raw.decode_content = True
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.ods')
+                with temp_file:
+                    shutil.copyfileobj(response.raw, temp_file, length=65536)
 
             print(f"✓ Downloaded FCDO ODS file: {temp_file.name}")
             return temp_file.name
@@ -426,7 +503,14 @@ class BFPOScraperSimple:
         print(f"\nParsing FCDO ODS file: {ods_file}")
 
         try:
-            df = pd.read_excel(ods_file, engine='odf')
+            # Prefer the Rust-based calamine reader - odfpy parses the
+            # XML-over-zip in pure Python and is an order of magnitude
+            # slower. ValueError covers pandas < 2.2, which does not know
+            # the engine at all
+            try:
+                df = pd.read_excel(ods_file, engine='calamine')
+            except (ImportError, ValueError):
+                df = pd.read_excel(ods_file, engine='odf')
             print(f"✓ Loaded FCDO spreadsheet with {len(df)} rows")
 
             # The FCDO file has a multi-column layout:
@@ -457,33 +541,38 @@ class BFPOScraperSimple:
 
             fcdo_count = 0
 
-            # Process each row
-            for _, row in df.iterrows():
-                # Process each column group
-                for loc_col, bfpo_col, post_col in column_groups:
-                    try:
-                        location = str(row[loc_col]).strip()
-                        bfpo_num = str(row[bfpo_col]).strip()
-                        postcode = str(row[post_col]).strip()
-
-                        # Skip if any field is NaN or empty
-                        if location == 'nan' or location == '' or bfpo_num == 'nan' or bfpo_num == '':
-                            continue
-
-                        # Clean up postcode
-                        if postcode == 'nan' or postcode == '':
-                            postcode = None
-
-                        # Try to infer country from location name
-                        country = self._infer_country_from_location(location)
-
-                        # Add address
-                        self._add_address(bfpo_num, location, postcode, country, 'fcdo')
-                        fcdo_count += 1
-
-                    except Exception as e:
-                        # Skip invalid entries in this column group
-                        continue
+            if column_groups:
+                # Stack the column groups vertically and clean them with
+                # vectorised string kernels instead of per-row iterrows()
+                loc_series = pd.concat(
+                    [df[g[0]] for g in column_groups], ignore_index=True
+                ).astype(str).str.strip()
+                bfpo_series = pd.concat(
+                    [df[g[1]] for g in column_groups], ignore_index=True
+                ).astype(str).str.strip()
+                post_series = pd.concat(
+                    [df[g[2]] for g in column_groups], ignore_index=True
+                ).astype(str).str.strip()
+
+                # Skip entries where location or BFPO number is NaN or empty
+                mask = (loc_series.notna() & bfpo_series.notna()
+                        & ~loc_series.isin(('nan', ''))
+                        & ~bfpo_series.isin(('nan', '')))
+
+                for location, bfpo_num, postcode in zip(
+                        loc_series[mask].to_numpy(),
+                        bfpo_series[mask].to_numpy(),
+                        post_series[mask].to_numpy()):
+                    # Clean up postcode
+                    if pd.isna(postcode) or postcode in ('nan', ''):
+                        postcode = None
+
+                    # Try to infer country from location name
+                    country = self._infer_country_from_location(location)
+
+                    # Add address
+                    self._add_address(bfpo_num, location, postcode, country, 'fcdo')
+                    fcdo_count += 1
 
             print(f"✓ Parsed {fcdo_count} FCDO locations")
 
@@ -494,112 +583,22 @@ class BFPOScraperSimple:
     def _infer_country_from_location(self, location: str) -> Optional[str]:
         """
         Infer country name from location string.
-        
+
         FCDO locations typically follow patterns like:
         - "British Embassy Ankara" → Turkey
         - "British High Commission Ottawa" → Canada
         - "British Consulate General New York" → USA
         """
-        location_lower = location.lower()
-
-        # Common patterns for inferring country from city/location
-        country_patterns = {
-            # Europe
-            'ankara': 'Turkey',
-            'paris': 'France',
-            'berlin': 'Germany',
-            'madrid': 'Spain',
-            'rome': 'Italy',
-            'athens': 'Greece',
-            'vienna': 'Austria',
-            'brussels': 'Belgium',
-            'amsterdam': 'Netherlands',
-            'dublin': 'Ireland',
-            'lisbon': 'Portugal',
-            'copenhagen': 'Denmark',
-            'stockholm': 'Sweden',
-            'oslo': 'Norway',
-            'helsinki': 'Finland',
-            'warsaw': 'Poland',
-            'prague': 'Czech Republic',
-            'budapest': 'Hungary',
-            'bucharest': 'Romania',
-            'sofia': 'Bulgaria',
-            'moscow': 'Russia',
-
-            # Americas
-            'ottawa': 'Canada',
-            'washington': 'USA',
-            'new york': 'USA',
-            'los angeles': 'USA',
-            'san francisco': 'USA',
-            'chicago': 'USA',
-            'boston': 'USA',
-            'atlanta': 'USA',
-            'mexico city': 'Mexico',
-            'brasilia': 'Brazil',
-            'buenos aires': 'Argentina',
-            'santiago': 'Chile',
-            'lima': 'Peru',
-            'bogota': 'Colombia',
-
-            # Asia
-            'tokyo': 'Japan',
-            'beijing': 'China',
-            'shanghai': 'China',
-            'seoul': 'South Korea',
-            'delhi': 'India',
-            'mumbai': 'India',
-            'bangkok': 'Thailand',
-            'singapore': 'Singapore',
-            'jakarta': 'Indonesia',
-            'manila': 'Philippines',
-            'kuala lumpur': 'Malaysia',
-            'hanoi': 'Vietnam',
-            'islamabad': 'Pakistan',
-            'kabul': 'Afghanistan',
-            'tehran': 'Iran',
-            'riyadh': 'Saudi Arabia',
-            'dubai': 'United Arab Emirates',
-            'abu dhabi': 'United Arab Emirates',
-
-            # Oceania
-            'canberra': 'Australia',
-            'sydney': 'Australia',
-            'melbourne': 'Australia',
-            'wellington': 'New Zealand',
-            'auckland': 'New Zealand',
-
-            # Africa
-            'cairo': 'Egypt',
-            'nairobi': 'Kenya',
-            'johannesburg': 'South Africa',
-            'pretoria': 'South Africa',
-            'lagos': 'Nigeria',
-            'abuja': 'Nigeria',
-            'addis ababa': 'Ethiopia',
-            'accra': 'Ghana',
-            'dar es salaam': 'Tanzania',
-            'kampala': 'Uganda',
-        }
-
-        # Check each pattern
-        for pattern, country in country_patterns.items():
-            if pattern in location_lower:
-                return country
-
-        # If no match found, return None
-        return None
+        # Single C-level scan over the string instead of one substring
+        # check per known city
+        match = self._CITY_PATTERN.search(location.lower())
+        return self._CITY_TO_COUNTRY[match.group(0)] if match else None
 
     def generate_xml(self) -> None:
         """Generate XML configuration file."""
         print(f"\nGenerating XML: {self.output_file}")
 
-        # Create root element
-        root = ET.Element('Config')
-
-        # Add comment
-        comment = ET.Comment(f'''
+        comment = etree.Comment(f'''
 BFPO Address Configuration
 Generated from GOV.UK BFPO locations
 Last Updated: {datetime.now().strftime("%Y-%m-%d")}
@@ -607,41 +606,45 @@ Created By: Affinis Ltd (Dominic Digby)
 Schema: bfpo_config.xsd
 Country Codes: ISO 3166-1 alpha-2 (via pycountry)
 ''')
-        root.append(comment)
 
-        # Sort addresses by BFPO number (extract numeric part)
-        def get_sort_key(addr):
-            bfpo_num = addr['BfpoNum'].replace('BFPO ', '').strip()
-            return int(bfpo_num) if bfpo_num.isdigit() else 999
+        # Sort addresses by BFPO number (numeric key precomputed at insert)
+        self.addresses.sort(key=operator.attrgetter('sort_key'))
 
-        self.addresses.sort(key=get_sort_key)
+        # Stream each BFFO_Address to disk as it is built, so peak memory
+        # stays at one address element instead of the whole document tree.
+        # Children must still be created with SubElement in their parent's
+        # context - appending detached lxml Elements created in another
+        # document context degrades to quadratic time
+        with etree.xmlfile(self.output_file, encoding='utf-8') as xf:
+            xf.write_declaration()
+            with xf.element('Config'):
+                xf.write('\n')
+                xf.write(comment, pretty_print=True)
 
-        # Add BFPO addresses
-        for addr in self.addresses:
-            addr_elem = ET.SubElement(root, 'BFFO_Address')
+                for addr in self.addresses:
+                    addr_elem = etree.Element('BFFO_Address')
 
-            # Required fields
-            ET.SubElement(addr_elem, 'BfpoNum').text = addr['BfpoNum']
+                    # Required fields
+                    etree.SubElement(addr_elem, 'BfpoNum').text = addr.BfpoNum
 
-            # Optional BoxNum (for isolated detachments)
-            if 'BoxNum' in addr:
-                ET.SubElement(addr_elem, 'BoxNum').text = addr['BoxNum']
+                    # Optional BoxNum (for isolated detachments)
+                    if addr.BoxNum:
+                        etree.SubElement(addr_elem, 'BoxNum').text = addr.BoxNum
 
-            ET.SubElement(addr_elem, 'Loc').text = addr['Loc']
+                    etree.SubElement(addr_elem, 'Loc').text = addr.Loc
 
-            # Optional fields
-            if 'PstCd' in addr:
-                ET.SubElement(addr_elem, 'PstCd').text = addr['PstCd']
-            if 'Ctry' in addr:
-                ET.SubElement(addr_elem, 'Ctry').text = addr['Ctry']
-            if 'CtryCd' in addr and addr['CtryCd']:
-                ET.SubElement(addr_elem, 'CtryCd').text = addr['CtryCd']
+                    # Optional fields
+                    if addr.PstCd:
+                        etree.SubElement(addr_elem, 'PstCd').text = addr.PstCd
+                    if addr.Ctry:
+                        etree.SubElement(addr_elem, 'Ctry').text = addr.Ctry
+                    if addr.CtryCd:
+                        etree.SubElement(addr_elem, 'CtryCd').text = addr.CtryCd
 
-            # Type (required)
-            ET.SubElement(addr_elem, 'Type').text = addr['Type']
+                    # Type (required)
+                    etree.SubElement(addr_elem, 'Type').text = addr.Type
 
-        # Write with pretty formatting
-        self._write_pretty_xml(root, self.output_file)
+                    xf.write(addr_elem, pretty_print=True)
 
         print(f"✓ Generated XML with {len(self.addresses)} BFPO addresses")
 
@@ -650,8 +653,8 @@ Country Codes: ISO 3166-1 alpha-2 (via pycountry)
 
     def _print_country_stats(self) -> None:
         """Print statistics about country code resolution."""
-        total_with_country = sum(1 for addr in self.addresses if 'Ctry' in addr)
-        total_with_code = sum(1 for addr in self.addresses if 'CtryCd' in addr)
+        total_with_country = sum(1 for addr in self.addresses if addr.Ctry)
+        total_with_code = sum(1 for addr in self.addresses if addr.CtryCd)
 
         print("\nCountry Code Statistics:")
         print(f"  Addresses with country name: {total_with_country}")
@@ -661,23 +664,10 @@ Country Codes: ISO 3166-1 alpha-2 (via pycountry)
             unmapped = total_with_country - total_with_code
             print(f"  ⚠ Unmapped countries: {unmapped}")
 
-            # Show which countries failed to map
-            unmapped_countries = set()
-            for addr in self.addresses:
-                if 'Ctry' in addr and 'CtryCd' not in addr:
-                    unmapped_countries.add(addr['Ctry'])
-
-            if unmapped_countries:
-                print(f"  Unmapped country names: {', '.join(sorted(unmapped_countries))}")
-
-    def _write_pretty_xml(self, root, filename: str) -> None:
-        """Write XML with pretty formatting."""
-        rough_string = ET.tostring(root, encoding='utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="\t", encoding='utf-8')
-
-        with open(filename, 'wb') as f:
-            f.write(pretty_xml)
+        # Show which countries failed to map (collected by the resolver)
+        unmapped_countries = self.country_resolver.unmapped_names
+        if unmapped_countries:
+            print(f"  Unmapped country names: {', '.join(sorted(unmapped_countries))}")
 
     def run(self) -> None:
         """Main execution method."""
@@ -685,8 +675,19 @@ Country Codes: ISO 3166-1 alpha-2 (via pycountry)
         print("BFPO Data Scraper - Simplified Schema (with pycountry)")
         print("=" * 80)
 
-        # Scrape GOV.UK
-        self.scrape_gov_uk_bfpo()
+        # Fire both downloads concurrently - they hit independent hosts and
+        # the wall time is dominated by the two network round trips
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            html_future = executor.submit(self._fetch_gov_uk_html)
+            fcdo_future = None
+            if not self.fcdo_ods_file:
+                fcdo_future = executor.submit(self.download_fcdo_ods)
+
+            html = html_future.result()
+            downloaded_ods = fcdo_future.result() if fcdo_future else None
+
+        # Parse GOV.UK
+        self.parse_gov_uk_html(html)
 
         # Handle FCDO ODS file
         ods_file = None
@@ -696,9 +697,8 @@ Country Codes: ISO 3166-1 alpha-2 (via pycountry)
             # Use pre-downloaded file
             print(f"\nUsing pre-downloaded FCDO ODS file: {self.fcdo_ods_file}")
             ods_file = self.fcdo_ods_file
-        else:
-            # Try to download
-            ods_file = self.download_fcdo_ods()
+        elif downloaded_ods is not None:
+            ods_file = downloaded_ods
             cleanup_temp = True
 
         # Parse FCDO data if we have a file